@@ -0,0 +1,26 @@
+"""JSON helpers: orjson's Rust encoder when available, stdlib json otherwise."""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+
+    def loads(data):
+        return orjson.loads(data)
+
+    def dumps(obj):
+        return orjson.dumps(obj).decode()
+
+    def dumps_bytes(obj):
+        return orjson.dumps(obj)
+
+else:
+    loads = json.loads
+    dumps = json.dumps
+
+    def dumps_bytes(obj):
+        return json.dumps(obj).encode()
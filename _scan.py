@@ -0,0 +1,88 @@
+"""Shared keyword-scan primitive used by the classifier and extractor agents.
+
+The preferred path is a pyahocorasick automaton, which sweeps the content once
+at C speed. When the extension is unavailable, a single compiled-regex
+alternation over all keywords keeps the inner matching loop in C as well,
+instead of iterating tokens at interpreter speed.
+"""
+
+import re
+
+try:
+    import ahocorasick  # pyahocorasick: C-implemented multi-pattern scanner
+except ImportError:
+    ahocorasick = None
+
+# Below this size, tokenizing and intersecting frozensets beats sweeping an
+# automaton whose setup cost is amortized over longer contents.
+_SHORT_CONTENT_LIMIT = 2048
+_TOKEN_RE = re.compile(r"[a-z]+")
+
+
+class KeywordScanner:
+    """Counts keyword hits per (category, label) slot in one pass."""
+
+    def __init__(self, categories):
+        # A keyword may belong to several categories (e.g. "invoice" counts
+        # for both email intent and PDF type), so each maps to all its slots.
+        self._slots_by_keyword = {}
+        for category, keyword_map in categories.items():
+            for label, keywords in keyword_map.items():
+                for keyword in keywords:
+                    self._slots_by_keyword.setdefault(keyword, []).append(
+                        (category, label)
+                    )
+        # Per-slot frozensets of single-word keywords for the short-content
+        # path; multi-word phrases can't be token-matched and keep a substring
+        # check each.
+        token_sets = {}
+        self._phrase_slots = []
+        for keyword, slots in self._slots_by_keyword.items():
+            if " " in keyword:
+                self._phrase_slots.append((keyword, slots))
+            else:
+                for slot in slots:
+                    token_sets.setdefault(slot, set()).add(keyword)
+        self._token_sets = {slot: frozenset(kws) for slot, kws in token_sets.items()}
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword, slots in self._slots_by_keyword.items():
+                self._automaton.add_word(keyword, tuple(slots))
+            self._automaton.make_automaton()
+            self._pattern = None
+        else:
+            self._automaton = None
+            # Longest-first so the alternation prefers whole phrases over
+            # keywords that happen to be their prefixes.
+            ordered = sorted(self._slots_by_keyword, key=len, reverse=True)
+            self._pattern = re.compile("|".join(map(re.escape, ordered)))
+
+    def scan(self, content_lower):
+        """Return {(category, label): hit count} for the lowered content."""
+        if len(content_lower) <= _SHORT_CONTENT_LIMIT:
+            return self._scan_short(content_lower)
+        counts = {}
+        if self._automaton is not None:
+            for _, slots in self._automaton.iter(content_lower):
+                for slot in slots:
+                    counts[slot] = counts.get(slot, 0) + 1
+            return counts
+        slots_by_keyword = self._slots_by_keyword
+        for match in self._pattern.finditer(content_lower):
+            for slot in slots_by_keyword[match.group()]:
+                counts[slot] = counts.get(slot, 0) + 1
+        return counts
+
+    def _scan_short(self, content_lower):
+        """Set-intersection scan: tokenize once, intersect per slot in C."""
+        counts = {}
+        tokens = frozenset(_TOKEN_RE.findall(content_lower))
+        for slot, keywords in self._token_sets.items():
+            matched = len(tokens & keywords)
+            if matched:
+                counts[slot] = matched
+        for phrase, slots in self._phrase_slots:
+            if phrase in content_lower:
+                for slot in slots:
+                    counts[slot] = counts.get(slot, 0) + 1
+        return counts
@@ -0,0 +1,269 @@
+"""Data extractor agent: pulls structured fields out of PDFs, JSON, emails and text."""
+
+import email
+import io
+import os
+import re
+from datetime import datetime
+from email import policy
+
+import _jsonutil
+from _scan import KeywordScanner
+
+# Compiled once at import so the hot extraction paths skip re's per-call
+# cache lookup and pattern normalization.
+_EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+
+# Combined field patterns: one alternation per extractor means one linear scan
+# over the content instead of one full pass per field type.
+_EMAIL_FIELDS_RE = re.compile(
+    r"(?P<email>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b)"
+    r"|(?P<phone>\b\d{3}-\d{3}-\d{4}\b|\(\d{3}\)\s?\d{3}-\d{4}\b)"
+    r"|(?P<amount>\$\s?\d[\d,]*(?:\.\d{2})?)"
+)
+_PDF_FIELDS_RE = re.compile(
+    r"(?P<amount>\$\s?\d[\d,]*(?:\.\d{2})?)"
+    r"|(?P<date>\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b)"
+    r"|(?:invoice|inv)[\s#:]*(?P<invoice_number>\d+)",
+    re.IGNORECASE,
+)
+
+
+class DataExtractor:
+    """Extracts structured data and lightweight analysis from uploaded files."""
+
+    def __init__(self):
+        self.email_intent_keywords = {
+            "Invoice": ["invoice", "payment due", "bill", "amount due", "remittance"],
+            "Complaint": ["complaint", "dissatisfied", "unacceptable", "refund", "disappointed"],
+            "RFQ": ["request for quote", "quotation", "rfq", "pricing", "quote"],
+            "General": ["hello", "information", "question", "inquiry"],
+        }
+        self.urgency_keywords = {
+            "High": ["urgent", "asap", "immediately", "critical", "emergency"],
+            "Medium": ["soon", "important", "priority", "this week"],
+        }
+        self.sentiment_keywords = {
+            "positive": ["thank", "great", "excellent", "appreciate", "pleased", "happy"],
+            "negative": ["angry", "terrible", "unacceptable", "disappointed", "frustrated", "worst"],
+        }
+        self.pdf_type_keywords = {
+            "Invoice": ["invoice", "amount due", "total due", "bill to", "payment terms"],
+            "Report": ["report", "summary", "analysis", "findings", "conclusion"],
+            "Contract": ["agreement", "contract", "party", "terms and conditions", "hereby"],
+        }
+        # One scanner over all keyword categories: a single linear pass over
+        # the lowered content yields intent, urgency, sentiment and PDF-type
+        # counts at once.
+        self._scanner = KeywordScanner({
+            "email_intent": self.email_intent_keywords,
+            "urgency": self.urgency_keywords,
+            "sentiment": self.sentiment_keywords,
+            "pdf_type": self.pdf_type_keywords,
+        })
+
+    def _scan_counts(self, content_lower):
+        """Count keyword hits for every category/label in one pass."""
+        return self._scanner.scan(content_lower)
+
+    def extract_from_file(self, file_path):
+        """Dispatch extraction based on the file extension."""
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension == ".pdf":
+            return self._extract_from_pdf(file_path)
+        if extension == ".json":
+            return self.extract_from_json(file_path)
+        if extension == ".eml":
+            return self._extract_from_email(file_path)
+        return self._extract_from_text(file_path)
+
+    def extract_from_bytes(self, data, filename):
+        """Extract from already-buffered upload bytes without touching the disk."""
+        extension = os.path.splitext(filename)[1].lower()
+        if extension == ".pdf":
+            return self._extract_pdf_stream(io.BytesIO(data))
+        if extension == ".json":
+            return self._extract_json_data(_jsonutil.loads(data), raw=data)
+        if extension == ".eml":
+            return self._extract_email_message(
+                email.message_from_bytes(data, policy=policy.default)
+            )
+        return self._extract_text_content(data.decode("utf-8", errors="ignore"))
+
+    def _extract_from_pdf(self, file_path):
+        with open(file_path, "rb") as f:
+            return self._extract_pdf_stream(f)
+
+    def _extract_pdf_stream(self, stream):
+        # Imported lazily: PyPDF2 is heavy and JSON/email/text requests (and
+        # worker startup) never need it. After the first call this is just a
+        # sys.modules lookup.
+        import PyPDF2
+
+        pdf_reader = PyPDF2.PdfReader(stream)
+        pages = pdf_reader.pages
+        num_pages = len(pages)
+        text = "\n".join(page.extract_text() or "" for page in pages)
+        content_lower = text.lower()
+        counts = self._scan_counts(content_lower)
+        return {
+            "type": "pdf",
+            "page_count": num_pages,
+            "document_type": self._classify_pdf_type(counts),
+            "urgency": self._detect_urgency(counts),
+            "fields": self._extract_pdf_fields(text),
+            "text_length": len(text),
+            "extracted_at": datetime.now().isoformat(),
+        }
+
+    def extract_from_json(self, file_path):
+        with open(file_path, "rb") as f:
+            raw = f.read()
+        return self._extract_json_data(_jsonutil.loads(raw), raw=raw)
+
+    def _extract_json_data(self, data, raw=None):
+        return {
+            "type": "json",
+            "top_level_keys": list(data.keys()) if isinstance(data, dict) else [],
+            "anomalies": self._detect_json_anomalies(data, raw=raw),
+            "extracted_at": datetime.now().isoformat(),
+        }
+
+    def _extract_from_email(self, file_path):
+        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+            return self._extract_email_message(
+                email.message_from_file(f, policy=policy.default)
+            )
+
+    def _extract_email_message(self, msg):
+        body = self._extract_email_body(msg)
+        content_lower = body.lower()
+        counts = self._scan_counts(content_lower)
+        return {
+            "type": "email",
+            "sender": msg.get("From") or self._extract_sender_from_text(body),
+            "subject": msg.get("Subject", ""),
+            "intent": self._classify_email_intent(counts),
+            "urgency": self._detect_urgency(counts),
+            "sentiment": self._analyze_sentiment(counts),
+            "fields": self._extract_email_fields(body),
+            "extracted_at": datetime.now().isoformat(),
+        }
+
+    def _extract_from_text(self, file_path):
+        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+            return self._extract_text_content(f.read())
+
+    def _extract_text_content(self, content):
+        content_lower = content.lower()
+        counts = self._scan_counts(content_lower)
+        return {
+            "type": "text",
+            "sender": self._extract_sender_from_text(content),
+            "intent": self._classify_email_intent(counts),
+            "urgency": self._detect_urgency(counts),
+            "sentiment": self._analyze_sentiment(counts),
+            "fields": self._extract_email_fields(content),
+            "extracted_at": datetime.now().isoformat(),
+        }
+
+    def _extract_email_body(self, msg):
+        # get_body walks only as deep as needed to honor the preference list,
+        # and get_content handles transfer decoding and charsets for us.
+        body_part = msg.get_body(preferencelist=("plain", "html"))
+        if body_part is None:
+            return ""
+        return body_part.get_content()
+
+    def _extract_sender_from_text(self, content):
+        matches = _EMAIL_RE.findall(content)
+        return matches[0] if matches else "unknown"
+
+    def _extract_email_fields(self, content):
+        fields = {"emails": [], "phones": [], "amounts": []}
+        buckets = {"email": fields["emails"], "phone": fields["phones"], "amount": fields["amounts"]}
+        for match in _EMAIL_FIELDS_RE.finditer(content):
+            buckets[match.lastgroup].append(match.group())
+        return fields
+
+    def _extract_pdf_fields(self, content):
+        fields = {"amounts": [], "dates": [], "invoice_numbers": []}
+        buckets = {
+            "amount": fields["amounts"],
+            "date": fields["dates"],
+            "invoice_number": fields["invoice_numbers"],
+        }
+        for match in _PDF_FIELDS_RE.finditer(content):
+            buckets[match.lastgroup].append(match.group(match.lastgroup))
+        return fields
+
+    def _classify_email_intent(self, counts):
+        scores = {
+            label: counts.get(("email_intent", label), 0)
+            for label in self.email_intent_keywords
+        }
+        best = max(scores, key=scores.get)
+        return best if scores[best] > 0 else "General"
+
+    def _detect_urgency(self, counts):
+        if counts.get(("urgency", "High"), 0):
+            return "High"
+        if counts.get(("urgency", "Medium"), 0):
+            return "Medium"
+        return "Low"
+
+    def _analyze_sentiment(self, counts):
+        positive = counts.get(("sentiment", "positive"), 0)
+        negative = counts.get(("sentiment", "negative"), 0)
+        if positive > negative:
+            return "positive"
+        if negative > positive:
+            return "negative"
+        return "neutral"
+
+    def _classify_pdf_type(self, counts):
+        scores = {
+            label: counts.get(("pdf_type", label), 0)
+            for label in self.pdf_type_keywords
+        }
+        best = max(scores, key=scores.get)
+        return best if scores[best] > 0 else "Document"
+
+    def _detect_json_anomalies(self, data, raw=None):
+        # Cheap negative filter on the raw bytes: a bare null token always
+        # contains b"null" and an empty string is always the two bytes b'""',
+        # and bytes.__contains__ is a memmem-speed scan. Only payloads that
+        # could contain an anomaly pay for the tree walk.
+        if raw is not None and b"null" not in raw and b'""' not in raw:
+            return {"has_null_values": False, "has_empty_strings": False}
+        has_null, has_empty = self._scan_anomalies(data)
+        return {
+            "has_null_values": has_null,
+            "has_empty_strings": has_empty,
+        }
+
+    def _scan_anomalies(self, obj):
+        """Walk the JSON tree once, returning (has_null, has_empty_string).
+
+        Uses an explicit stack rather than recursion so deeply nested payloads
+        neither hit the recursion limit nor pay per-level call overhead, and
+        stops as soon as both anomalies have been seen.
+        """
+        has_null = False
+        has_empty = False
+        stack = [obj]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                has_null = True
+            elif node == "":
+                has_empty = True
+            elif isinstance(node, dict):
+                stack.extend(node.values())
+            elif isinstance(node, list):
+                stack.extend(node)
+            else:
+                continue
+            if has_null and has_empty:
+                break
+        return has_null, has_empty
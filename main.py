@@ -0,0 +1,142 @@
+"""FastAPI entry point for the multi-agent intake system."""
+
+import hashlib
+import io
+import os
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+import aiofiles
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi.responses import ORJSONResponse
+from starlette.concurrency import run_in_threadpool
+
+from classifier_agent import ClassifierAgent
+from data_extractor import DataExtractor
+from database import get_extracted_data, get_history, init_db, save_extracted_data
+from schemas import ProfileUpdate, StoreData
+
+UPLOAD_DIR = "uploads"
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+_CHUNK_SIZE = 1 << 20
+
+app = FastAPI(title="Multi-Agent Intake System", default_response_class=ORJSONResponse)
+
+classifier = ClassifierAgent()
+data_extractor = DataExtractor()
+
+
+def _now_iso():
+    # Second precision is all the API reports; skipping microsecond
+    # formatting shaves the per-request timestamp cost.
+    return datetime.now().isoformat(timespec="seconds")
+
+
+user_profiles = {}
+
+# LRU of classify+extract results keyed by upload content, so re-uploading an
+# identical file skips the PDF parse, keyword scan and field extraction.
+_RESULT_CACHE_SIZE = 256
+_result_cache = OrderedDict()  # (sha256 hexdigest, input_type) -> (classification, extracted)
+
+
+@app.on_event("startup")
+async def startup():
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    init_db()
+
+
+@app.post("/process")
+async def process_user_input(file: UploadFile = File(...), input_type: str = Form(None)):
+    record_id = uuid.uuid4().hex
+    file_path = os.path.join(UPLOAD_DIR, f"{record_id}_{file.filename}")
+    # Each chunk is teed to the hash, the async disk write and an in-memory
+    # buffer. The buffer deliberately holds the whole body (bounded by
+    # MAX_UPLOAD_BYTES, so up to 50MB per in-flight request): that RAM buys
+    # skipping a full re-read of the file from disk before classification.
+    # The disk copy itself is still written chunk-by-chunk through aiofiles,
+    # so the event loop is never blocked by a synchronous write.
+    written = 0
+    hasher = hashlib.sha256()
+    buffer = io.BytesIO()
+    try:
+        async with aiofiles.open(file_path, "wb") as f:
+            while chunk := await file.read(_CHUNK_SIZE):
+                written += len(chunk)
+                if written > MAX_UPLOAD_BYTES:
+                    raise HTTPException(status_code=413, detail="File too large")
+                hasher.update(chunk)
+                buffer.write(chunk)
+                await f.write(chunk)
+    except HTTPException:
+        os.remove(file_path)
+        raise
+
+    cache_key = (hasher.hexdigest(), input_type)
+    cached = _result_cache.get(cache_key)
+    if cached is not None:
+        _result_cache.move_to_end(cache_key)
+        classification, extracted_data = cached
+    else:
+        # PDF parsing, regex field extraction and the keyword scan are all
+        # CPU/disk bound; run them on worker threads so the event loop keeps
+        # serving other requests.
+        data = buffer.getvalue()
+        classification = await run_in_threadpool(
+            classifier.classify_bytes, data, file.filename, input_type
+        )
+        extracted_data = await run_in_threadpool(
+            data_extractor.extract_from_bytes, data, file.filename
+        )
+        _result_cache[cache_key] = (classification, extracted_data)
+        if len(_result_cache) > _RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+    save_extracted_data(
+        record_id, file.filename, classification["format"], classification, extracted_data
+    )
+    return {
+        "record_id": record_id,
+        "classification": classification,
+        "extracted_data": extracted_data,
+        "timestamp": _now_iso(),
+    }
+
+
+@app.get("/extract/{record_id}")
+async def get_extraction_page(record_id: str):
+    record = get_extracted_data(record_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Record not found")
+    return record
+
+
+@app.get("/history")
+async def history():
+    return {"history": get_history()}
+
+
+@app.post("/store")
+async def store_data_backend(payload: StoreData):
+    record_id = save_extracted_data(
+        payload.record_id,
+        payload.original_filename,
+        payload.file_type,
+        payload.classification,
+        payload.extracted_data,
+    )
+    # Plain dict response (shape documented by schemas.StoreResponse): skips
+    # building and re-validating a response model per request.
+    return {"record_id": record_id, "status": "stored", "timestamp": _now_iso()}
+
+
+@app.put("/profile")
+async def update_profile(profile: ProfileUpdate):
+    stored = user_profiles.setdefault(profile.user_id, {})
+    stored.update(profile.dict(exclude_none=True))
+    return {"user_id": profile.user_id, "profile": stored}
+
+
+@app.get("/health")
+async def health_check():
+    return {"status": "ok", "timestamp": _now_iso()}
@@ -0,0 +1,331 @@
+"""Memory manager: SQLite-backed key-value and conversation memory."""
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+import _jsonutil
+
+# Registered once at import: any datetime a caller binds becomes an int unix
+# timestamp via a C-level conversion, matching the INTEGER expires_at column.
+# The stdlib's default adapter (deprecated in 3.12) would format an ISO string
+# through isoformat() on every bind instead.
+sqlite3.register_adapter(datetime, lambda value: int(value.timestamp()))
+
+# SQL hoisted to constants: Python's sqlite3 caches compiled statements per
+# connection keyed by the exact statement text, so reusing the same string
+# objects means each statement is parsed and planned once per connection.
+# UPSERT updates a conflicting row in place; INSERT OR REPLACE would delete it
+# and insert anew, doubling the B-tree (and WAL) writes on every overwrite.
+_SQL_STORE = (
+    "INSERT INTO memory_store (key, data, expires_at) VALUES (?, ?, ?) "
+    "ON CONFLICT(key) DO UPDATE SET data = excluded.data, "
+    "expires_at = excluded.expires_at, created_at = CURRENT_TIMESTAMP"
+)
+_SQL_GET = "SELECT data, expires_at FROM memory_store WHERE key = ?"
+_SQL_DELETE = "DELETE FROM memory_store WHERE key = ?"
+_SQL_ALL = "SELECT key, data FROM memory_store WHERE expires_at IS NULL OR expires_at > ?"
+# created_at has only second granularity, so it is not unique; key breaks
+# ties to make the ordering total. The composite predicate resumes exactly
+# after the last (created_at, key) pair instead of skipping every row that
+# shares the boundary second.
+_SQL_PAGE_FIRST = (
+    "SELECT key, data, created_at FROM memory_store "
+    "WHERE expires_at IS NULL OR expires_at > ? "
+    "ORDER BY created_at DESC, key DESC LIMIT ?"
+)
+_SQL_PAGE_NEXT = (
+    "SELECT key, data, created_at FROM memory_store "
+    "WHERE (expires_at IS NULL OR expires_at > ?) "
+    "AND (created_at < ? OR (created_at = ? AND key < ?)) "
+    "ORDER BY created_at DESC, key DESC LIMIT ?"
+)
+_SQL_CLEANUP = "DELETE FROM memory_store WHERE expires_at IS NOT NULL AND expires_at <= ?"
+_SQL_INSERT_CONV = (
+    "INSERT INTO conversation_history (conversation_id, message_type, content, metadata) "
+    "VALUES (?, ?, ?, ?)"
+)
+_SQL_GET_CONV = (
+    "SELECT message_type, content, metadata, created_at FROM conversation_history "
+    "WHERE conversation_id = ? ORDER BY created_at"
+)
+# Opportunistic cleanup cadence: every N writes, expired rows are purged in
+# the background so reads never scan an ever-growing tail of tombstones.
+_CLEANUP_INTERVAL_WRITES = 512
+
+# Hot keys served from process memory: a hit skips the SQL execute and
+# B-tree lookup. The raw blob is cached and decoded per hit so every caller
+# gets its own object — handing out one shared decoded dict would let one
+# caller's mutation corrupt every later read.
+_READ_CACHE_SIZE = 1024
+
+_SQL_STATS = (
+    "SELECT COUNT(*), "
+    "SUM(CASE WHEN expires_at IS NOT NULL AND expires_at <= ? THEN 1 ELSE 0 END) "
+    "FROM memory_store"
+)
+
+
+class MemoryManager:
+    """Persistent memory shared by the agents, backed by SQLite."""
+
+    def __init__(self, db_path="intake_system.db"):
+        self.db_path = db_path
+        # One long-lived connection per thread: opening a connection costs
+        # syscalls and allocation on every call, and a reused connection keeps
+        # SQLite's page cache hot across operations.
+        self._local = threading.local()
+        self._writes_since_cleanup = 0
+        self._cache = OrderedDict()  # key -> (expires_at, raw blob)
+        self._cache_lock = threading.Lock()
+        self._init_memory_tables()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, cached_statements=256)
+            # journal_mode persists in the file; the remaining pragmas are
+            # per-connection and must be applied to each new one.
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA mmap_size=268435456")
+            self._local.conn = conn
+        return conn
+
+    def _init_memory_tables(self):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        # WAL journaling sticks to the database file, so every later
+        # short-lived connection inherits it: readers proceed concurrently
+        # with writers and commits no longer rewrite the whole journal.
+        # synchronous=NORMAL is durable enough under WAL and skips an fsync
+        # per commit; temp_store/mmap keep sorting and page reads in memory.
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS memory_store (
+                key TEXT PRIMARY KEY,
+                data BLOB NOT NULL,
+                expires_at INTEGER,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS conversation_history (
+                id INTEGER PRIMARY KEY,
+                conversation_id TEXT NOT NULL,
+                message_type TEXT NOT NULL,
+                content TEXT NOT NULL,
+                metadata BLOB,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        # History reads filter on conversation_id and order by created_at;
+        # expiry predicates scan expires_at. Without these, both degrade to
+        # full table scans as the tables grow. The partial index skips the
+        # (typically dominant) rows that never expire.
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_conv_id_time "
+            "ON conversation_history(conversation_id, created_at)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_mem_expires "
+            "ON memory_store(expires_at) WHERE expires_at IS NOT NULL"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_mem_created "
+            "ON memory_store(created_at DESC, key DESC)"
+        )
+        conn.commit()
+        conn.close()
+
+    def store(self, key, data, ttl_hours=None):
+        # Integer unix timestamps: no datetime adapter on bind, integer
+        # comparisons in the B-tree, and smaller index keys than ISO strings.
+        expires_at = int(time.time() + ttl_hours * 3600) if ttl_hours else None
+        conn = self._conn()
+        conn.execute(_SQL_STORE, (key, _jsonutil.dumps_bytes(data), expires_at))
+        conn.commit()
+        with self._cache_lock:
+            self._cache.pop(key, None)
+        # Heuristic, not exact: a lost increment under contention just delays
+        # the next background purge by a few writes.
+        self._writes_since_cleanup += 1
+        if self._writes_since_cleanup >= _CLEANUP_INTERVAL_WRITES:
+            self._writes_since_cleanup = 0
+            threading.Thread(target=self.cleanup_expired, daemon=True).start()
+        return True
+
+    def get(self, key):
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                expires_at, raw = entry
+                if expires_at is not None and expires_at <= time.time():
+                    del self._cache[key]
+                    return None
+                self._cache.move_to_end(key)
+            else:
+                raw = None
+        if raw is not None:
+            # Decode outside the lock; a fresh object per hit keeps callers'
+            # mutations from leaking into each other through the cache.
+            return _jsonutil.loads(raw)
+        cursor = self._conn().execute(_SQL_GET, (key,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        raw, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            return None
+        with self._cache_lock:
+            self._cache[key] = (expires_at, raw)
+            if len(self._cache) > _READ_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return _jsonutil.loads(raw)
+
+    def delete(self, key):
+        conn = self._conn()
+        deleted = conn.execute(_SQL_DELETE, (key,)).rowcount
+        conn.commit()
+        with self._cache_lock:
+            self._cache.pop(key, None)
+        return deleted > 0
+
+    def get_all_memory(self):
+        cursor = self._conn().execute(_SQL_ALL, (int(time.time()),))
+        return {key: _jsonutil.loads(data) for key, data in cursor.fetchall()}
+
+    def iter_memory(self, limit=1000, after_created_at=None, after_key=None):
+        """Yield one page of non-expired entries, newest first.
+
+        Keyset pagination on the created_at index: pass the last row's
+        created_at and key back as after_created_at/after_key for the next
+        page, so callers that only need recent entries never decode the
+        whole table. created_at alone is not unique (second granularity),
+        so the key tiebreaker keeps rows sharing a second from being
+        skipped across page boundaries. Yields (key, data, created_at)
+        tuples.
+        """
+        now = int(time.time())
+        if after_created_at is None:
+            cursor = self._conn().execute(_SQL_PAGE_FIRST, (now, limit))
+        else:
+            cursor = self._conn().execute(
+                _SQL_PAGE_NEXT,
+                (now, after_created_at, after_created_at, after_key, limit),
+            )
+        for key, data, created_at in cursor:
+            yield key, _jsonutil.loads(data), created_at
+
+    def cleanup_expired(self):
+        conn = self._conn()
+        deleted = conn.execute(_SQL_CLEANUP, (int(time.time()),)).rowcount
+        conn.commit()
+        return deleted
+
+    def store_conversation(self, conversation_id, message_type, content, metadata=None):
+        conn = self._conn()
+        cursor = conn.execute(
+            _SQL_INSERT_CONV,
+            (
+                conversation_id,
+                message_type,
+                content,
+                _jsonutil.dumps_bytes(metadata) if metadata else None,
+            ),
+        )
+        conn.commit()
+        return cursor.lastrowid
+
+    def store_conversation_many(self, messages):
+        """Insert a batch of conversation messages in one transaction.
+
+        Each message is a (conversation_id, message_type, content) tuple with
+        an optional trailing metadata dict. One executemany plus a single
+        commit amortizes the fsync across the whole batch instead of paying
+        it per row. Returns the number of messages inserted.
+        """
+        rows = []
+        for message in messages:
+            conversation_id, message_type, content = message[:3]
+            metadata = message[3] if len(message) > 3 else None
+            rows.append(
+                (
+                    conversation_id,
+                    message_type,
+                    content,
+                    _jsonutil.dumps_bytes(metadata) if metadata else None,
+                )
+            )
+        conn = self._conn()
+        conn.executemany(_SQL_INSERT_CONV, rows)
+        conn.commit()
+        return len(rows)
+
+    def iter_conversation_history(self, conversation_id):
+        """Yield decoded history rows lazily, 256 rows per fetch.
+
+        Long conversations never hold both the raw rows and the decoded
+        dicts in memory at once; callers that stop early stop the query.
+        """
+        cursor = self._conn().execute(_SQL_GET_CONV, (conversation_id,))
+        cursor.arraysize = 256
+        while rows := cursor.fetchmany():
+            for message_type, content, metadata, created_at in rows:
+                yield {
+                    "message_type": message_type,
+                    "content": content,
+                    "metadata": _jsonutil.loads(metadata) if metadata else None,
+                    "created_at": created_at,
+                }
+
+    def get_conversation_history(self, conversation_id):
+        return list(self.iter_conversation_history(conversation_id))
+
+    def get_conversation_histories(self, conversation_ids):
+        """Fetch histories for several conversations in one query.
+
+        A single IN-clause select (one prepare, one ranged scan of the
+        composite index) replaces a query per conversation. Returns
+        {conversation_id: [messages]} with an entry for every requested id.
+        """
+        histories = {conversation_id: [] for conversation_id in conversation_ids}
+        if not conversation_ids:
+            return histories
+        placeholders = ",".join("?" * len(conversation_ids))
+        cursor = self._conn().execute(
+            "SELECT conversation_id, message_type, content, metadata, created_at "
+            f"FROM conversation_history WHERE conversation_id IN ({placeholders}) "
+            "ORDER BY conversation_id, created_at",
+            tuple(conversation_ids),
+        )
+        for conversation_id, message_type, content, metadata, created_at in cursor:
+            histories[conversation_id].append(
+                {
+                    "message_type": message_type,
+                    "content": content,
+                    "metadata": _jsonutil.loads(metadata) if metadata else None,
+                    "created_at": created_at,
+                }
+            )
+        return histories
+
+    def get_memory_stats(self):
+        # One conditional aggregate: a single prepare and one table (or index)
+        # pass instead of two separate COUNT queries.
+        total, expired = self._conn().execute(_SQL_STATS, (int(time.time()),)).fetchone()
+        expired = expired or 0
+        return {
+            "total_entries": total,
+            "expired_entries": expired,
+            "active_entries": total - expired,
+        }
@@ -0,0 +1,31 @@
+"""Request/response schemas for the intake API."""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class ProfileUpdate(BaseModel):
+    user_id: str
+    name: Optional[str] = None
+    email: Optional[str] = None
+
+
+class StoreDetails(BaseModel):
+    source: str
+    notes: Optional[str] = None
+
+
+class StoreData(BaseModel):
+    record_id: str
+    original_filename: str
+    file_type: str
+    classification: dict
+    extracted_data: dict
+    details: Optional[StoreDetails] = None
+
+
+class StoreResponse(BaseModel):
+    record_id: str
+    status: str
+    timestamp: str